@@ -3,13 +3,25 @@ Analytics module - Process auction data for dashboard
 """
 
 import os
+import re
 import json
 import csv
-from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from collections import defaultdict
 
-from .config import DATA_DIR, ARCHIVE_DIR, BUYNOW_DIR, EMIRATES_CONFIG
+from .config import DATA_DIR, ARCHIVE_DIR, BUYNOW_DIR, ALL_EMIRATES, DISPLAY_NAMES, URL_SLUGS, STATUS_AVAILABLE, STATUS_SOLD, utc_timestamp
+from .files import ARCHIVE_CSV_RE, iter_files, row_projector
+
+
+# Strips thousands separators from price cells in one pass
+_PRICE_CLEAN = str.maketrans('', '', ',')
+
+# Buy Now filenames, e.g. ajman_buynow.csv (archive CSVs use files.ARCHIVE_CSV_RE)
+_BUYNOW_RE = re.compile(r'^(?P<emirate>[a-z_]+)_buynow\.csv$')
+
+# Only these columns are read when aggregating, the rest of each row is dropped
+_STATS_COLUMNS = ('plate_number', 'final_price', 'price')
+_BUYNOW_STATS_COLUMNS = ('plate_number', 'price', 'status')
 
 
 def get_digit_count(plate_number: str) -> int:
@@ -17,106 +29,219 @@ def get_digit_count(plate_number: str) -> int:
     return len(str(plate_number).strip())
 
 
-def load_archived_auctions() -> List[Dict]:
-    """Load all archived auction CSV files"""
-    auctions = []
+def parse_price(value) -> int:
+    """Convert a raw price cell (int, '1500' or '1,500') to an int"""
+    if isinstance(value, int):
+        return value
+    text = str(value)
+    try:
+        # Archived CSVs are written with plain integers, so this is the common path
+        return int(text)
+    except ValueError:
+        return int(text.translate(_PRICE_CLEAN))
+
+
+def _iter_matching_files(directory: str, pattern: re.Pattern) -> Iterator[Tuple[re.Match, os.DirEntry]]:
+    """Yield (match, entry) for regular files in directory whose name matches pattern"""
+    for entry in iter_files(directory):
+        match = pattern.match(entry.name)
+        if match:
+            yield match, entry
+
+
+def read_csv_columns(filepath: str, usecols: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """
+    Read a CSV file into a dict of column name -> list of cell values.
+    
+    Rows are projected with files.row_projector and transposed once
+    instead of building a dict per row. Short rows are padded with '' and
+    blank lines are skipped, matching csv.DictReader. If ``usecols`` is
+    given, only those columns are kept (columns missing from the file are
+    left out).
+    """
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return {}
+        
+        wanted = None if usecols is None else set(usecols)
+        # Each name once; a repeated header reads its last column, as with csv.DictReader
+        names = list(dict.fromkeys(name for name in header if wanted is None or name in wanted))
+        if not names:
+            return {}
+        
+        project = row_projector(header, names)
+        rows = [project(row) for row in reader if row]
+    
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(values) for name, values in zip(names, columns)}
+
+
+def scan_archived_auctions() -> List[Dict]:
+    """
+    Aggregate archived auction CSVs without loading their rows.
+    
+    Each file is read column-wise and aggregated straight away, so only
+    the per-auction summary is kept in memory.
+    """
+    summaries = []
     
     if not os.path.exists(ARCHIVE_DIR):
-        return auctions
-    
-    for filename in os.listdir(ARCHIVE_DIR):
-        if filename.endswith('.csv') and not filename.startswith('tracking'):
-            filepath = os.path.join(ARCHIVE_DIR, filename)
-            
-            # Parse emirate and date from filename (e.g., sharjah_2024-12-24.csv)
-            parts = filename.replace('.csv', '').split('_')
-            emirate = parts[0] if parts else 'unknown'
-            date_str = parts[1] if len(parts) > 1 else ''
-            
-            plates = []
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        plates.append(row)
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}")
-                continue
-            
-            auctions.append({
-                'emirate': emirate,
-                'date': date_str,
-                'filename': filename,
-                'plates': plates,
-                'count': len(plates),
-            })
-    
-    return sorted(auctions, key=lambda x: x['date'])
-
-
-def load_buynow_data() -> Dict[str, List[Dict]]:
-    """Load all Buy Now CSV files"""
-    data = {}
+        return summaries
+    
+    # Parse emirate and date from filename (e.g., sharjah_2024-12-24.csv)
+    for match, entry in _iter_matching_files(ARCHIVE_DIR, ARCHIVE_CSV_RE):
+        emirate, date_str = match['emirate'], match['date']
+        filepath = entry.path
+        
+        try:
+            stats = calculate_column_stats(read_csv_columns(filepath, _STATS_COLUMNS))
+        except Exception as e:
+            print(f"Error reading {filepath}: {e}")
+            continue
+        
+        summaries.append({
+            'emirate': emirate,
+            'date': date_str,
+            'filename': entry.name,
+            'count': stats.get('total_plates', 0),
+            'stats': stats,
+        })
+    
+    return sorted(summaries, key=lambda x: x['date'])
+
+
+def scan_buynow_data() -> Dict[str, Dict]:
+    """
+    Summarize all Buy Now CSV files without building per-row dicts.
+    
+    Returns emirate -> {available, sold, total, stats}, where stats covers
+    the available plates only.
+    """
+    summary = {}
     
     if not os.path.exists(BUYNOW_DIR):
-        return data
-    
-    for filename in os.listdir(BUYNOW_DIR):
-        if filename.endswith('_buynow.csv'):
-            emirate = filename.replace('_buynow.csv', '')
-            filepath = os.path.join(BUYNOW_DIR, filename)
-            
-            plates = []
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        plates.append(row)
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}")
-                continue
-            
-            data[emirate] = plates
-    
-    return data
-
-
-def calculate_auction_stats(plates: List[Dict]) -> Dict:
-    """Calculate statistics for a list of plates"""
-    if not plates:
-        return {}
+        return summary
     
-    # Group by digit count
-    by_digits = defaultdict(list)
-    all_prices = []
+    for match, entry in _iter_matching_files(BUYNOW_DIR, _BUYNOW_RE):
+        emirate = match['emirate']
+        filepath = entry.path
+        
+        try:
+            columns = read_csv_columns(filepath, _BUYNOW_STATS_COLUMNS)
+        except Exception as e:
+            print(f"Error reading {filepath}: {e}")
+            continue
+        
+        plate_numbers = columns.get('plate_number', [])
+        total = len(plate_numbers)
+        statuses = columns.get('status', [''] * total)
+        prices = columns.get('price', [0] * total)
+        
+        available = [(num, price) for num, price, status in zip(plate_numbers, prices, statuses) if status == STATUS_AVAILABLE]
+        summary[emirate] = {
+            'available': len(available),
+            'sold': statuses.count(STATUS_SOLD),
+            'total': total,
+            'stats': _stats_from_pairs(available),
+        }
     
-    for plate in plates:
+    return summary
+
+
+def _bucket_prices(pairs: Iterable[Tuple[Any, Any]]) -> Tuple[int, Dict[int, List[int]]]:
+    """
+    Single-pass aggregation kernel behind the stats helpers.
+    
+    Takes (plate_number, raw_price) pairs and returns the number of rows
+    seen and a mapping of digit count -> [count, sum, min, max] over
+    positive prices.
+    """
+    total_plates = 0
+    by_digits = {}
+    # Bind hot lookups to locals for the tight loop
+    get_bucket = by_digits.get
+    to_price = parse_price
+    
+    for plate_num, raw_price in pairs:
+        total_plates += 1
         try:
-            price = int(str(plate.get('final_price', 0) or plate.get('price', 0) or 0).replace(',', ''))
-            plate_num = str(plate.get('plate_number', ''))
-            digits = get_digit_count(plate_num)
-            
-            if price > 0:
-                by_digits[digits].append(price)
-                all_prices.append(price)
+            price = to_price(raw_price or 0)
+            digits = len(str(plate_num).strip())
         except (ValueError, TypeError):
             continue
+        
+        if price <= 0:
+            continue
+        bucket = get_bucket(digits)
+        if bucket is None:
+            by_digits[digits] = [1, price, price, price]
+            continue
+        bucket[0] += 1
+        bucket[1] += price
+        if price < bucket[2]:
+            bucket[2] = price
+        elif price > bucket[3]:
+            bucket[3] = price
+    
+    return total_plates, by_digits
+
+
+def calculate_auction_stats(plates: Iterable[Dict]) -> Dict:
+    """
+    Calculate statistics for a list of plates.
+    
+    Works in a single pass, so ``plates`` may be any iterable of rows
+    (e.g. a csv.DictReader) instead of a fully loaded list.
+    """
+    return _stats_from_pairs(
+        (plate.get('plate_number', ''), plate.get('final_price', 0) or plate.get('price', 0))
+        for plate in plates
+    )
+
+
+def calculate_column_stats(columns: Dict[str, List[str]]) -> Dict:
+    """Calculate the same statistics as calculate_auction_stats from CSV columns"""
+    plate_numbers = columns.get('plate_number', [])
+    final_prices = columns.get('final_price')
+    prices = columns.get('price')
+    
+    if final_prices is not None and prices is not None:
+        raw_prices = [fp or p for fp, p in zip(final_prices, prices)]
+    else:
+        raw_prices = final_prices if final_prices is not None else prices
+    if raw_prices is None:
+        raw_prices = [0] * len(plate_numbers)
+    
+    return _stats_from_pairs(zip(plate_numbers, raw_prices))
+
+
+def _stats_from_pairs(pairs: Iterable[Tuple[Any, Any]]) -> Dict:
+    """Build the stats dict from (plate_number, raw_price) pairs"""
+    total_plates, by_digits = _bucket_prices(pairs)
+    
+    if not total_plates:
+        return {}
+    
+    priced_count = sum(b[0] for b in by_digits.values())
+    total_value = sum(b[1] for b in by_digits.values())
     
     stats = {
-        'total_plates': len(plates),
-        'total_value': sum(all_prices),
-        'avg_price': int(sum(all_prices) / len(all_prices)) if all_prices else 0,
-        'min_price': min(all_prices) if all_prices else 0,
-        'max_price': max(all_prices) if all_prices else 0,
+        'total_plates': total_plates,
+        'total_value': total_value,
+        'avg_price': int(total_value / priced_count) if priced_count else 0,
+        'min_price': min(b[2] for b in by_digits.values()) if by_digits else 0,
+        'max_price': max(b[3] for b in by_digits.values()) if by_digits else 0,
         'by_digits': {},
     }
     
-    for digits, prices in sorted(by_digits.items()):
+    for digits, (count, total, low, high) in sorted(by_digits.items()):
         stats['by_digits'][str(digits)] = {
-            'count': len(prices),
-            'avg': int(sum(prices) / len(prices)),
-            'min': min(prices),
-            'max': max(prices),
+            'count': count,
+            'avg': int(total / count),
+            'min': low,
+            'max': high,
         }
     
     return stats
@@ -127,43 +252,29 @@ def generate_dashboard_data() -> Dict[str, Any]:
     print("Generating dashboard data...")
     
     # Load all data
-    auctions = load_archived_auctions()
-    buynow = load_buynow_data()
+    auctions = scan_archived_auctions()
+    buynow = scan_buynow_data()  # per-emirate Buy Now summary
     
     # Auction trends by emirate
     auction_trends = defaultdict(list)
     for auction in auctions:
-        emirate = auction['emirate']
-        stats = calculate_auction_stats(auction['plates'])
-        auction_trends[emirate].append({
+        auction_trends[auction['emirate']].append({
             'date': auction['date'],
             'count': auction['count'],
-            **stats,
+            **auction['stats'],
         })
     
-    # Buy Now summary
-    buynow_summary = {}
-    for emirate, plates in buynow.items():
-        available = [p for p in plates if p.get('status') == 'available']
-        sold = [p for p in plates if p.get('status') == 'sold']
-        buynow_summary[emirate] = {
-            'available': len(available),
-            'sold': len(sold),
-            'total': len(plates),
-            'stats': calculate_auction_stats(available),
-        }
-    
     # Emirates info
     emirates_info = {
-        key: {'display_name': cfg['display_name'], 'url_slug': cfg['url_slug']}
-        for key, cfg in EMIRATES_CONFIG.items()
+        key: {'display_name': DISPLAY_NAMES[key], 'url_slug': URL_SLUGS[key]}
+        for key in ALL_EMIRATES
     }
     
     dashboard_data = {
-        'generated_at': datetime.utcnow().isoformat() + 'Z',
+        'generated_at': utc_timestamp(),
         'emirates': emirates_info,
         'auction_trends': dict(auction_trends),
-        'buynow': buynow_summary,
+        'buynow': buynow,
         'summary': {
             'total_auctions': len(auctions),
             'emirates_with_data': list(set(a['emirate'] for a in auctions)),
@@ -174,6 +285,23 @@ def generate_dashboard_data() -> Dict[str, Any]:
     return dashboard_data
 
 
+def write_json_stream(data: Dict[str, Any], f) -> None:
+    """
+    Write a dict as JSON to a binary file one top-level key at a time.
+    
+    Each value is encoded separately (compact, so the C encoder is used)
+    and written straight away, so only the largest subtree is ever held
+    as a serialized string. Output has one top-level key per line.
+    """
+    f.write(b'{')
+    for i, (key, value) in enumerate(data.items()):
+        f.write(b',\n' if i else b'\n')
+        f.write(json.dumps(key, ensure_ascii=False).encode('utf-8'))
+        f.write(b': ')
+        f.write(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    f.write(b'\n}\n')
+
+
 def export_dashboard_json(output_path: str = None) -> str:
     """Export dashboard data to JSON file"""
     if output_path is None:
@@ -182,8 +310,8 @@ def export_dashboard_json(output_path: str = None) -> str:
     data = generate_dashboard_data()
     
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(output_path, 'wb') as f:
+        write_json_stream(data, f)
     
     print(f"Dashboard data exported to: {output_path}")
     return output_path
@@ -2,34 +2,114 @@
 API client for Emirates Auction
 """
 
+import json
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .config import (
     PLATES_ENDPOINT,
     EMIRATES_CONFIG,
+    DISPLAY_NAMES,
     REQUEST_TIMEOUT,
+    REQUEST_RETRIES,
+    REQUEST_BACKOFF_FACTOR,
     USER_AGENT,
 )
 
 
+# Strips thousands separators and spaces from price strings in one pass
+_PRICE_CLEAN = str.maketrans("", "", ", ")
+
+_READ_CHUNK_SIZE = 1 << 16
+
+
+def parse_price_str(value) -> int:
+    """
+    Convert an API price string (e.g. "15,000") to an int.
+    
+    Ints and plain digit strings skip the separator strip. Raises
+    ValueError for anything that isn't a number.
+    """
+    if type(value) is int:
+        return value
+    text = value if type(value) is str else str(value)
+    if text.isdigit():
+        return int(text)
+    return int(text.translate(_PRICE_CLEAN))
+
+
+def create_http_adapter(pool_maxsize: int = 10) -> HTTPAdapter:
+    """
+    Create an HTTPAdapter that retries transient failures with backoff.
+    
+    Retries happen inside urllib3 on the pooled connection, so a flaky
+    endpoint doesn't turn into an empty result for the whole run. The
+    400 "no auction" response is not retried.
+    """
+    retry = Retry(
+        total=REQUEST_RETRIES,
+        backoff_factor=REQUEST_BACKOFF_FACTOR,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False,
+    )
+    return HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the session shared by all API clients.
+    
+    Every emirate hits the same host, so reusing one pooled session keeps
+    the TCP/TLS connection alive across emirates instead of handshaking
+    per client. Sized so concurrent per-emirate fetches don't block.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update({
+                "Content-Type": "application/json",
+                "User-Agent": USER_AGENT,
+                "Accept": "application/json",
+                "Referer": "https://www.emiratesauction.com/",
+                "Origin": "https://www.emiratesauction.com",
+            })
+            session.mount("https://", create_http_adapter(pool_maxsize=len(EMIRATES_CONFIG)))
+            _session = session
+        return _session
+
+
+def read_json_response(response: requests.Response):
+    """
+    Read a streamed response body and decode it as JSON.
+    
+    Pulls the body in 64 KiB chunks (requests defaults to 10 KiB) and
+    parses the raw bytes directly, skipping requests' charset detection
+    and the bytes -> str copy that response.json() does.
+    """
+    return json.loads(b"".join(response.iter_content(chunk_size=_READ_CHUNK_SIZE)))
+
+
 class EmiratesAuctionAPI:
     """Client for interacting with Emirates Auction API"""
 
-    def __init__(self, emirate: str):
+    def __init__(self, emirate: str, session: Optional[requests.Session] = None):
         self.emirate = emirate
         config = EMIRATES_CONFIG.get(emirate, {})
         self.auction_type_id = config.get("auction_type_id", 0)
-        self.display_name = config.get("display_name", emirate)
+        self.display_name = DISPLAY_NAMES.get(emirate, emirate)
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json",
-            "Referer": "https://www.emiratesauction.com/",
-            "Origin": "https://www.emiratesauction.com",
-        })
+        self.session = session or get_session()
 
     def fetch_plates(self) -> dict:
         """
@@ -58,56 +138,60 @@ class EmiratesAuctionAPI:
         }
 
         try:
-            response = self.session.post(
+            # Streamed so the body is read in large chunks, then decoded once
+            with self.session.post(
                 PLATES_ENDPOINT,
                 json=payload,
-                timeout=REQUEST_TIMEOUT
-            )
-            
-            if response.status_code == 400:
-                error_data = response.json()
-                if "invalid.typeid" in str(error_data):
-                    return {
-                        "plates": [],
-                        "total_count": 0,
-                        "auction_info": {
-                            "auction_type_id": self.auction_type_id,
-                            "emirate": self.emirate,
-                            "display_name": self.display_name,
-                        },
-                        "is_active": False,
-                    }
-                print(f"API Error for {self.emirate}: {error_data}")
-                return {"plates": [], "total_count": 0, "auction_info": None, "is_active": False}
-            
-            response.raise_for_status()
-            data = response.json()
+                timeout=REQUEST_TIMEOUT,
+                stream=True,
+            ) as response:
+                status = response.status_code
+                if status >= 400:
+                    if status != 400:
+                        response.raise_for_status()
+                    error_data = read_json_response(response)
+                    if "invalid.typeid" in str(error_data):
+                        return self._empty_result(self._auction_info())
+                    print(f"API Error for {self.emirate}: {error_data}")
+                    return self._empty_result()
+                
+                data = read_json_response(response)
             
             return self._parse_response(data)
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"Error fetching plates for {self.emirate}: {e}")
-            return {"plates": [], "total_count": 0, "auction_info": None, "is_active": False}
+            return self._empty_result()
+
+    def _auction_info(self) -> dict:
+        """Auction metadata for this emirate"""
+        return {
+            "auction_type_id": self.auction_type_id,
+            "emirate": self.emirate,
+            "display_name": self.display_name,
+        }
+
+    def _empty_result(self, auction_info: Optional[dict] = None) -> dict:
+        """Result for a request that returned no plates"""
+        return {"plates": [], "total_count": 0, "auction_info": auction_info, "is_active": False}
 
     def _parse_response(self, data: dict) -> dict:
         """Parse API response into structured format"""
         plates = []
         items = data.get("Data", [])
         total_count = data.get("TotalCount", len(items))
+        # One clock read per response; remaining time is plain epoch arithmetic
+        now_ts = time.time()
         
         for item in items:
-            plate = self._parse_plate(item)
+            plate = self._parse_plate(item, now_ts)
             if plate:
                 plates.append(plate)
         
         is_active = len(plates) > 0
         
-        auction_info = {
-            "auction_type_id": self.auction_type_id,
-            "emirate": self.emirate,
-            "display_name": self.display_name,
-            "total_count": total_count,
-        }
+        auction_info = self._auction_info()
+        auction_info["total_count"] = total_count
         
         return {
             "plates": plates,
@@ -116,8 +200,10 @@ class EmiratesAuctionAPI:
             "is_active": is_active,
         }
 
-    def _parse_plate(self, item: dict) -> Optional[dict]:
+    def _parse_plate(self, item: dict, now_ts: Optional[float] = None) -> Optional[dict]:
         """Parse a single plate item from API response"""
+        if now_ts is None:
+            now_ts = time.time()
         try:
             lot_id = item.get("Id")
             if not lot_id:
@@ -128,9 +214,13 @@ class EmiratesAuctionAPI:
             
             current_price_str = item.get("CurrentPriceStr", "0")
             try:
-                current_price = int(str(current_price_str).replace(",", "").replace(" ", ""))
-            except (ValueError, AttributeError):
-                current_price = item.get("CurrentPrice", 0) or 0
+                current_price = parse_price_str(current_price_str)
+            except ValueError:
+                # Cast here so tracked prices are always ints for comparisons and sorts
+                try:
+                    current_price = int(item.get("CurrentPrice", 0) or 0)
+                except (TypeError, ValueError):
+                    current_price = 0
             
             bid_count = item.get("Bids", 0) or 0
             
@@ -140,11 +230,9 @@ class EmiratesAuctionAPI:
             
             if end_date_timestamp:
                 try:
-                    end_date = datetime.fromtimestamp(end_date_timestamp)
-                    now = datetime.now()
-                    delta = end_date - now
-                    time_remaining_seconds = max(0, int(delta.total_seconds()))
-                    end_date = end_date.isoformat()
+                    end_date_iso = datetime.fromtimestamp(end_date_timestamp).isoformat()
+                    time_remaining_seconds = max(0, int(end_date_timestamp - now_ts))
+                    end_date = end_date_iso
                 except (ValueError, TypeError, OSError):
                     pass
             
@@ -175,14 +263,17 @@ def fetch_current_plates(emirate: str) -> dict:
 def check_active_auctions() -> dict:
     """Check which emirates have active auctions."""
     results = {}
+    emirates = list(EMIRATES_CONFIG.keys())
+    
+    # Requests are independent and network-bound, so fetch them concurrently
+    with ThreadPoolExecutor(max_workers=len(emirates)) as executor:
+        fetched = executor.map(fetch_current_plates, emirates)
     
-    for emirate in EMIRATES_CONFIG.keys():
-        api = EmiratesAuctionAPI(emirate=emirate)
-        data = api.fetch_plates()
+    for emirate, data in zip(emirates, fetched):
         results[emirate] = {
             "is_active": data.get("is_active", False),
             "plate_count": data.get("total_count", 0),
-            "display_name": EMIRATES_CONFIG[emirate].get("display_name", emirate),
+            "display_name": DISPLAY_NAMES[emirate],
         }
     
     return results
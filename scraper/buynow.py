@@ -3,40 +3,66 @@ Buy Now plates scraper module - uses API endpoint
 """
 
 import os
+import sys
 import csv
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
 from .config import (
-    EMIRATES_CONFIG,
     BUYNOW_EMIRATES,
+    STATUS_AVAILABLE,
+    STATUS_SOLD,
+    DISPLAY_NAMES,
+    URL_SLUGS,
+    BUYNOW_TYPE_IDS,
     BUYNOW_DIR,
     BUYNOW_ARCHIVE_DIR,
     PLATES_BUYNOW_ENDPOINT,
     REQUEST_TIMEOUT,
-    USER_AGENT,
+    WRITE_BUFFER_SIZE,
     get_buynow_file,
+    utc_timestamp,
 )
+from .api import get_session, parse_price_str, read_json_response
+from .files import row_projector
+
+
+# Buy Now CSV columns, and the position of each one in a tracked row
+CSV_FIELDNAMES = ["emirate", "plate_number", "plate_code", "price", "first_seen", "last_seen", "status", "sold_at"]
+EMIRATE, PLATE_NUMBER, PLATE_CODE, PRICE, FIRST_SEEN, LAST_SEEN, STATUS, SOLD_AT = range(len(CSV_FIELDNAMES))
+
+
+def _stored_price(value: str) -> int:
+    """
+    Read a price cell from an existing Buy Now CSV as an int.
+    
+    Older files hold prices as the API returned them, e.g. "700.0" or
+    "1,500"; anything unreadable counts as 0 rather than failing the save.
+    """
+    try:
+        return parse_price_str(value or 0)
+    except ValueError:
+        try:
+            return int(float(value))
+        except (ValueError, OverflowError):
+            return 0
 
 
 class BuyNowScraper:
     """Scraper for Buy Now plates section using API"""
 
-    def __init__(self, emirate: str):
+    def __init__(self, emirate: str, session: Optional[requests.Session] = None):
         self.emirate = emirate
-        config = EMIRATES_CONFIG.get(emirate, {})
-        self.buynow_type_id = config.get("buynow_type_id")
-        self.display_name = config.get("display_name", emirate)
-        self.url_slug = config.get("url_slug", emirate)
+        self.buynow_type_id = BUYNOW_TYPE_IDS.get(emirate)
+        self.display_name = DISPLAY_NAMES.get(emirate, emirate)
+        self.url_slug = URL_SLUGS.get(emirate, emirate)
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json",
+        self.session = session or get_session()
+        # Only the Referer differs per emirate, so it's sent per request
+        self.headers = {
             "Referer": f"https://www.emiratesauction.com/plates/{self.url_slug}/buy-now",
-            "Origin": "https://www.emiratesauction.com",
-        })
+        }
 
     def fetch_plates(self) -> dict:
         """
@@ -49,7 +75,7 @@ class BuyNowScraper:
                 - is_available: whether there are plates available
         """
         if not self.buynow_type_id:
-            return {"plates": [], "total_count": 0, "is_available": False}
+            return self._empty_result()
         
         # Correct payload structure for Buy Now API
         payload = {
@@ -61,24 +87,31 @@ class BuyNowScraper:
         }
         
         try:
-            response = self.session.post(
+            with self.session.post(
                 PLATES_BUYNOW_ENDPOINT,
                 json=payload,
-                timeout=REQUEST_TIMEOUT
-            )
-            
-            # Handle 400 errors (no active Buy Now list)
-            if response.status_code == 400:
-                return {"plates": [], "total_count": 0, "is_available": False}
-            
-            response.raise_for_status()
-            data = response.json()
+                headers=self.headers,
+                timeout=REQUEST_TIMEOUT,
+                stream=True,
+            ) as response:
+                status = response.status_code
+                if status >= 400:
+                    # 400 means there is no active Buy Now list
+                    if status == 400:
+                        return self._empty_result()
+                    response.raise_for_status()
+                
+                data = read_json_response(response)
             
             return self._parse_response(data)
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"Error fetching Buy Now plates for {self.emirate}: {e}")
-            return {"plates": [], "total_count": 0, "is_available": False}
+            return self._empty_result()
+
+    def _empty_result(self) -> dict:
+        """Result for a request that returned no plates"""
+        return {"plates": [], "total_count": 0, "is_available": False}
 
     def _parse_response(self, data: dict) -> dict:
         """Parse API response into structured format"""
@@ -110,9 +143,13 @@ class BuyNowScraper:
             # Get price
             current_price_str = item.get("CurrentPriceStr", "0")
             try:
-                price = int(str(current_price_str).replace(",", "").replace(" ", ""))
-            except (ValueError, AttributeError):
-                price = item.get("CurrentPrice", 0) or 0
+                price = parse_price_str(current_price_str)
+            except ValueError:
+                # Cast as api.py does, so the CSV never stores a float like "700.0"
+                try:
+                    price = int(item.get("CurrentPrice", 0) or 0)
+                except (TypeError, ValueError):
+                    price = 0
 
             return {
                 "id": str(plate_id),
@@ -135,81 +172,121 @@ class BuyNowScraper:
         os.makedirs(BUYNOW_DIR, exist_ok=True)
         
         csv_path = get_buynow_file(self.emirate)
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        # One timestamp for every row touched in this run
+        timestamp = utc_timestamp()
+        
+        # Tracked plates as parallel columns in CSV_FIELDNAMES order, plus key -> row index
+        columns = [[] for _ in CSV_FIELDNAMES]
+        prices, statuses = columns[PRICE], columns[STATUS]
+        last_seen, sold_at = columns[LAST_SEEN], columns[SOLD_AT]
+        index = {}
         
         # Load existing plates to track history
-        existing_plates = {}
         had_existing_data = False
         if os.path.exists(csv_path):
-            with open(csv_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    key = f"{row['plate_code']}_{row['plate_number']}"
-                    existing_plates[key] = row
-                    had_existing_data = True
+            with open(csv_path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header:
+                    # Rows come back in CSV_FIELDNAMES order whatever the file's column layout
+                    project = row_projector(header, CSV_FIELDNAMES)
+                    for row in reader:
+                        if not row:
+                            continue
+                        row = list(project(row))
+                        # Keep price numeric in memory; csv.writer stringifies it on write
+                        row[PRICE] = _stored_price(row[PRICE])
+                        # Interned so status checks against the constants hit the identity fast path
+                        row[STATUS] = sys.intern(row[STATUS])
+                        key = (row[PLATE_CODE], row[PLATE_NUMBER])
+                        i = index.get(key)
+                        if i is None:
+                            index[key] = len(prices)
+                            for column, value in zip(columns, row):
+                                column.append(value)
+                        else:
+                            # Duplicate key: the later row wins, as with a dict
+                            for column, value in zip(columns, row):
+                                column[i] = value
+                        had_existing_data = True
         
         # Count available plates before update
-        available_before = sum(1 for p in existing_plates.values() if p.get("status") == "available")
+        available_before = statuses.count(STATUS_AVAILABLE)
         
-        # Update with new plates
+        # Update with new plates; `changed` records whether the file needs rewriting
+        changed = not os.path.exists(csv_path)
+        seen_keys = set()
         for plate in plates:
-            key = f"{plate['plate_code']}_{plate['plate_number']}"
-            if key not in existing_plates:
+            key = (plate['plate_code'], plate['plate_number'])
+            seen_keys.add(key)
+            i = index.get(key)
+            if i is None:
                 # New plate
-                existing_plates[key] = {
-                    "emirate": self.display_name,
-                    "plate_number": plate["plate_number"],
-                    "plate_code": plate["plate_code"],
-                    "price": plate["price"],
-                    "first_seen": timestamp,
-                    "last_seen": timestamp,
-                    "status": "available",
-                    "sold_at": "",
-                }
+                index[key] = len(prices)
+                new_row = (
+                    self.display_name,
+                    plate["plate_number"],
+                    plate["plate_code"],
+                    plate["price"],
+                    timestamp,  # first_seen
+                    timestamp,  # last_seen
+                    STATUS_AVAILABLE,
+                    "",  # sold_at
+                )
+                for column, value in zip(columns, new_row):
+                    column.append(value)
+                changed = True
             else:
                 # Update existing
-                existing_plates[key]["last_seen"] = timestamp
-                existing_plates[key]["price"] = plate["price"]
-                if existing_plates[key].get("status") == "sold":
-                    existing_plates[key]["status"] = "available"
-                    existing_plates[key]["sold_at"] = ""
+                last_seen[i] = timestamp
+                prices[i] = plate["price"]
+                if statuses[i] == STATUS_SOLD:
+                    statuses[i] = STATUS_AVAILABLE
+                    sold_at[i] = ""
+                changed = True
         
         # Mark disappeared plates as sold
-        current_keys = {f"{p['plate_code']}_{p['plate_number']}" for p in plates}
-        for key, data in existing_plates.items():
-            if key not in current_keys and data.get("status") == "available":
-                data["status"] = "sold"
-                data["sold_at"] = timestamp
+        for key in index.keys() - seen_keys:
+            i = index[key]
+            if statuses[i] == STATUS_AVAILABLE:
+                statuses[i] = STATUS_SOLD
+                sold_at[i] = timestamp
+                changed = True
         
         # Check archive conditions
-        available_after = sum(1 for p in existing_plates.values() if p.get("status") == "available")
+        available_after = statuses.count(STATUS_AVAILABLE)
         all_sold = had_existing_data and available_after == 0
         list_empty = had_existing_data and len(plates) == 0
         should_archive = all_sold or list_empty
         
-        # Write CSV
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            fieldnames = ["emirate", "plate_number", "plate_code", "price", "first_seen", "last_seen", "status", "sold_at"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            
-            sorted_plates = sorted(
-                existing_plates.values(), 
-                key=lambda x: int(x.get("price", 0) or 0), 
-                reverse=True
-            )
-            for plate in sorted_plates:
-                writer.writerow(plate)
+        # Keep the existing file when no row changed (e.g. the list is still
+        # empty and everything was already sold) instead of rewriting the history
+        if changed:
+            self._write_csv(csv_path, columns)
         
         return {
             "csv_path": csv_path,
             "should_archive": should_archive,
             "available_before": available_before,
             "available_after": available_after,
-            "total_plates": len(existing_plates),
+            "total_plates": len(prices),
             "archive_reason": "all_sold" if all_sold else ("list_empty" if list_empty else None)
         }
 
+    def _write_csv(self, csv_path: str, columns: List[list]) -> None:
+        """Write tracked columns as rows sorted by price, replacing the file atomically"""
+        prices = columns[PRICE]
+        # Sort row indices rather than the rows; reverse=True keeps ties in file order
+        order = sorted(range(len(prices)), key=prices.__getitem__, reverse=True)
+        rows = list(zip(*columns))
+        
+        tmp_path = f"{csv_path}.tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDNAMES)
+            writer.writerows(rows[i] for i in order)
+        os.replace(tmp_path, csv_path)
+
     def archive_buynow_data(self) -> Optional[str]:
         """
         Archive the Buy Now CSV file to archive directory.
@@ -222,7 +299,7 @@ class BuyNowScraper:
             return None
         
         os.makedirs(BUYNOW_ARCHIVE_DIR, exist_ok=True)
-        timestamp_str = datetime.utcnow().strftime("%Y-%m-%d_%H%M%S")
+        timestamp_str = datetime.now(timezone.utc).strftime("%Y-%m-%d_%H%M%S")
         archive_path = os.path.join(BUYNOW_ARCHIVE_DIR, f"{self.emirate}_buynow_{timestamp_str}.csv")
         
         # Copy to archive (keep original for tracking new plates)
@@ -233,9 +310,19 @@ class BuyNowScraper:
         return archive_path
 
 
-def scrape_buynow_emirate(emirate: str) -> dict:
-    """Scrape Buy Now plates for a single emirate"""
-    display_name = EMIRATES_CONFIG.get(emirate, {}).get("display_name", emirate)
+def fetch_buynow_plates(emirate: str) -> dict:
+    """Convenience function to fetch Buy Now plates for an emirate"""
+    return BuyNowScraper(emirate).fetch_plates()
+
+
+def scrape_buynow_emirate(emirate: str, data: Optional[dict] = None) -> dict:
+    """
+    Scrape Buy Now plates for a single emirate.
+    
+    If ``data`` is given (already fetched via fetch_buynow_plates), the API
+    call is skipped and only the CSV tracking/archiving is done.
+    """
+    display_name = DISPLAY_NAMES.get(emirate, emirate)
     
     print(f"\n{'='*50}")
     print(f"Buy Now: {display_name}")
@@ -247,8 +334,9 @@ def scrape_buynow_emirate(emirate: str) -> dict:
         print(f"No Buy Now section for {display_name}")
         return {"emirate": emirate, "status": "no_section", "count": 0}
     
-    print(f"Fetching Buy Now plates from API...")
-    data = scraper.fetch_plates()
+    if data is None:
+        print(f"Fetching Buy Now plates from API...")
+        data = scraper.fetch_plates()
     
     plate_count = data.get("total_count", 0)
     print(f"Found {plate_count} plates from API")
@@ -290,13 +378,18 @@ def scrape_all_buynow() -> dict:
     print(f"\n{'='*60}")
     print("BUY NOW PLATES SCRAPER")
     print(f"{'='*60}")
-    print(f"Checking: {', '.join([EMIRATES_CONFIG[e]['display_name'] for e in BUYNOW_EMIRATES])}")
+    print(f"Checking: {', '.join(DISPLAY_NAMES[e] for e in BUYNOW_EMIRATES)}")
     
     results = {}
     total_plates = 0
     
+    # Fetch all emirates concurrently (network-bound), then save sequentially
+    print("Fetching Buy Now plates from API...")
+    with ThreadPoolExecutor(max_workers=len(BUYNOW_EMIRATES)) as executor:
+        fetched = dict(zip(BUYNOW_EMIRATES, executor.map(fetch_buynow_plates, BUYNOW_EMIRATES)))
+    
     for emirate in BUYNOW_EMIRATES:
-        result = scrape_buynow_emirate(emirate)
+        result = scrape_buynow_emirate(emirate, data=fetched[emirate])
         results[emirate] = result
         total_plates += result.get("count", 0)
     
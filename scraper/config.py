@@ -2,6 +2,9 @@
 Configuration constants for Emirates Auction Scraper
 """
 
+from datetime import datetime, timezone
+from typing import Optional
+
 # API Endpoints
 API_BASE_URL = "https://apiv8.emiratesauction.net/api"
 PLATES_ENDPOINT = f"{API_BASE_URL}/Plates"
@@ -61,20 +64,46 @@ ALL_EMIRATES = list(EMIRATES_CONFIG.keys())
 # Emirates with Buy Now sections (Ajman, RAK, UAQ, Fujairah only)
 BUYNOW_EMIRATES = [e for e, c in EMIRATES_CONFIG.items() if c.get("buynow_type_id")]
 
+# Flat lookup tables so hot paths do one dict lookup instead of chained .get()s
+DISPLAY_NAMES = {e: c["display_name"] for e, c in EMIRATES_CONFIG.items()}
+URL_SLUGS = {e: c["url_slug"] for e, c in EMIRATES_CONFIG.items()}
+BUYNOW_TYPE_IDS = {e: c.get("buynow_type_id") for e, c in EMIRATES_CONFIG.items()}
+
 # Timing thresholds
 FINAL_HOURS_THRESHOLD_MINUTES = 120  # 2 hours - switch to rapid mode
+STATE_SAVE_INTERVAL_SECONDS = 30  # min gap between tracking file writes (unforced)
 
 # File paths (relative to repo root)
 DATA_DIR = "data"
 ARCHIVE_DIR = f"{DATA_DIR}/archive"
 BUYNOW_DIR = f"{DATA_DIR}/buynow"
 BUYNOW_ARCHIVE_DIR = f"{ARCHIVE_DIR}/buynow"
+ARCHIVE_INDEX_FILE = f"{ARCHIVE_DIR}/.index.json"  # parsed-archive cache, local only
+EXPORT_STAMP_FILE = f"{ARCHIVE_DIR}/.data.json.stamp"  # inputs of the last dashboard export, local only
+
+# UTC timestamps stored in CSV/JSON output, e.g. 2026-01-16T17:13:37.123456Z
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+# Buy Now plate statuses as stored in the CSV status column
+STATUS_AVAILABLE = "available"
+STATUS_SOLD = "sold"
+
+# Buffer size for CSV/JSON output files (fewer write syscalls on large outputs)
+WRITE_BUFFER_SIZE = 1 << 20
 
 # Request settings
 REQUEST_TIMEOUT = 30
+REQUEST_RETRIES = 3  # retries on connection errors / 429 / 5xx
+REQUEST_BACKOFF_FACTOR = 0.5  # sleep 0.5s, 1s, 2s between retries
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 
+def utc_timestamp(now_ts: Optional[float] = None) -> str:
+    """Format epoch seconds (default now) as a UTC TIMESTAMP_FORMAT string"""
+    moment = datetime.now(timezone.utc) if now_ts is None else datetime.fromtimestamp(now_ts, timezone.utc)
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+
 def get_tracking_file(emirate: str) -> str:
     """Get the tracking file path for a specific emirate"""
     return f"{DATA_DIR}/tracking_{emirate}.json"
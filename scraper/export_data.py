@@ -3,23 +3,78 @@ Export auction data to JSON for the dashboard
 """
 
 import os
+import re
+import argparse
+import gzip
 import json
-import csv
-from datetime import datetime
-from .config import DATA_DIR, ARCHIVE_DIR, BUYNOW_DIR, BUYNOW_ARCHIVE_DIR, EMIRATES_CONFIG
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
+from .config import DATA_DIR, ARCHIVE_DIR, BUYNOW_DIR, BUYNOW_ARCHIVE_DIR, ARCHIVE_INDEX_FILE, EXPORT_STAMP_FILE, DISPLAY_NAMES, STATUS_AVAILABLE, STATUS_SOLD, utc_timestamp
+from .files import ARCHIVE_CSV_RE, iter_files, iter_csv_columns
 
 
-def load_buynow_csvs() -> dict:
-    """Load all Buy Now CSV files - separates available and sold"""
+# Bump when the layout of cached archive entries changes so old indexes are discarded
+ARCHIVE_INDEX_VERSION = 1
+
+# Upper bound on threads parsing archive files within one loader
+MAX_PARSE_WORKERS = 8
+
+# Archive filenames -> (emirate, date), matched in one pass instead of replace/split/join
+# (auction CSVs use files.ARCHIVE_CSV_RE, shared with analytics)
+_ARCHIVED_BUYNOW_RE = re.compile(r'^([^_]*)_[^_]*_(.*_.*)\.csv$')  # emirate_buynow_YYYY-MM-DD_HHMMSS.csv
+_ARCHIVED_TRACKING_RE = re.compile(r'^tracking_([^_]*)(?:_(.*))?\.json(?:\.gz)?$')  # tracking_emirate_YYYY-MM-DD_HHMMSS.json[.gz]
+
+
+def _scan_directories(*directories: str) -> dict:
+    """List each existing directory once: directory -> [DirEntry, ...] of its files"""
+    return {directory: list(iter_files(directory)) for directory in directories if os.path.isdir(directory)}
+
+
+def _fingerprint(listings: dict, output_path: str, pretty: bool = False) -> str:
+    """
+    Digest the name, mtime and size of every export input plus the output.
+    
+    Dotfiles (the archive index and temp files) are skipped. The output
+    file is included so a deleted or replaced data.json is re-exported,
+    and so is the output format so toggling PRETTY_JSON takes effect.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{ARCHIVE_INDEX_VERSION}:{int(pretty)}".encode())
+    for directory in sorted(listings):
+        for entry in sorted(listings[directory], key=attrgetter('name')):
+            if entry.name.startswith('.'):
+                continue
+            stat = entry.stat()
+            digest.update(f"{entry.path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    if os.path.exists(output_path):
+        stat = os.stat(output_path)
+        digest.update(f"{output_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def load_buynow_csvs(entries: list = None, now_iso: str = None) -> dict:
+    """
+    Load all Buy Now CSV files - separates available and sold.
+    
+    `now_iso` is the lastUpdated used for files without any last_seen
+    (defaults to the current time).
+    """
     data = {}
     
-    if not os.path.exists(BUYNOW_DIR):
-        return data
+    if entries is None:
+        if not os.path.exists(BUYNOW_DIR):
+            return data
+        entries = iter_files(BUYNOW_DIR)
+    
+    if now_iso is None:
+        now_iso = utc_timestamp()
     
-    for filename in os.listdir(BUYNOW_DIR):
+    for entry in entries:
+        filename = entry.name
         if filename.endswith('_buynow.csv'):
             emirate_key = filename.replace('_buynow.csv', '')
-            filepath = os.path.join(BUYNOW_DIR, filename)
+            filepath = entry.path
             
             available = []
             sold = []
@@ -27,67 +82,73 @@ def load_buynow_csvs() -> dict:
             
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
+                    columns = ('plate_number', 'plate_code', 'price', 'status', 'first_seen', 'last_seen', 'sold_at')
+                    rows = iter_csv_columns(f, columns, {'status': STATUS_AVAILABLE})
+                    for plate_number, plate_code, price, status, first_seen, last_seen, sold_at in rows:
                         plate = {
-                            'plate_number': row.get('plate_number', ''),
-                            'plate_code': row.get('plate_code', ''),
-                            'price': int(row.get('price', 0) or 0),
-                            'status': row.get('status', 'available'),
-                            'first_seen': row.get('first_seen', ''),
-                            'last_seen': row.get('last_seen', ''),
-                            'sold_at': row.get('sold_at', ''),
+                            'plate_number': plate_number,
+                            'plate_code': plate_code,
+                            'price': int(price or 0),
+                            'status': status,
+                            'first_seen': first_seen,
+                            'last_seen': last_seen,
+                            'sold_at': sold_at,
                         }
                         
-                        if plate['status'] == 'sold':
+                        if status == STATUS_SOLD:
                             sold.append(plate)
                         else:
                             available.append(plate)
                         
-                        if row.get('last_seen'):
-                            last_updated = row.get('last_seen')
+                        if last_seen:
+                            last_updated = last_seen
             except Exception as e:
                 print(f"Error reading {filepath}: {e}")
                 continue
             
-            display_name = EMIRATES_CONFIG.get(emirate_key, {}).get('display_name', emirate_key.title())
+            display_name = DISPLAY_NAMES.get(emirate_key) or emirate_key.title()
             
             data[emirate_key] = {
                 'emirate': display_name,
-                'available': sorted(available, key=lambda x: x['price'], reverse=True),
-                'sold': sorted(sold, key=lambda x: x.get('sold_at', ''), reverse=True),
+                'available': sorted(available, key=itemgetter('price'), reverse=True),
+                'sold': sorted(sold, key=itemgetter('sold_at'), reverse=True),
                 'available_count': len(available),
                 'sold_count': len(sold),
-                'lastUpdated': last_updated or datetime.utcnow().isoformat() + 'Z',
+                'lastUpdated': last_updated or now_iso,
             }
     
     return data
 
 
-def load_tracking_files() -> dict:
+def load_tracking_files(entries: list = None) -> dict:
     """Load all tracking JSON files for active auctions"""
     data = {}
     
-    for filename in os.listdir(DATA_DIR):
+    if entries is None:
+        entries = iter_files(DATA_DIR)
+    
+    for entry in entries:
+        filename = entry.name
         if filename.startswith('tracking_') and filename.endswith('.json'):
             emirate = filename.replace('tracking_', '').replace('.json', '')
-            filepath = os.path.join(DATA_DIR, filename)
+            filepath = entry.path
             
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    tracking = json.load(f)
+                with open(filepath, 'rb') as f:
+                    tracking = json.loads(f.read())
                 
                 if tracking.get('status') == 'active':
-                    plates = []
-                    for plate_id, plate_data in tracking.get('plates', {}).items():
-                        plates.append({
+                    plates = [
+                        {
                             'id': plate_id,
                             'plate_number': plate_data.get('plate_number', ''),
                             'plate_code': plate_data.get('plate_code', ''),
                             'price': plate_data.get('current_price', 0),
                             'bid_count': plate_data.get('bid_count', 0),
                             'status': plate_data.get('status', 'active'),
-                        })
+                        }
+                        for plate_id, plate_data in tracking.get('plates', {}).items()
+                    ]
                     
                     data[emirate] = {
                         'auction_id': tracking.get('auction_id', ''),
@@ -95,7 +156,7 @@ def load_tracking_files() -> dict:
                         'start_date': tracking.get('start_date', ''),
                         'last_updated': tracking.get('last_updated', ''),
                         'status': tracking.get('status', 'active'),
-                        'plates': sorted(plates, key=lambda x: x['price'], reverse=True),
+                        'plates': sorted(plates, key=itemgetter('price'), reverse=True),
                         'count': len(plates),
                     }
             except Exception as e:
@@ -105,193 +166,320 @@ def load_tracking_files() -> dict:
     return data
 
 
-def load_archive_csvs() -> list:
-    """Load archived auction results (CSV only)"""
+def _load_archive_index() -> dict:
+    """Load the parsed-archive cache, or an empty one if it is missing or unreadable"""
+    try:
+        with open(ARCHIVE_INDEX_FILE, 'rb') as f:
+            index = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return index if index.get('version') == ARCHIVE_INDEX_VERSION else {}
+
+
+def _save_archive_index(index: dict) -> None:
+    """Persist the parsed-archive cache"""
+    index['version'] = ARCHIVE_INDEX_VERSION
+    os.makedirs(os.path.dirname(ARCHIVE_INDEX_FILE), exist_ok=True)
+    tmp_path = f"{ARCHIVE_INDEX_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    os.replace(tmp_path, ARCHIVE_INDEX_FILE)
+
+
+def _load_archives(directory: str, matches, parse, cache: dict = None, entries: list = None) -> list:
+    """
+    Parse every archive file in a directory that `matches` accepts.
+    
+    Archives are dated snapshots that never change once written, so when
+    a `cache` section (filename -> {mtime_ns, size, entry}) is given, a
+    file is only re-parsed if its mtime or size differs from the cached
+    one. Entries for files that no longer exist are dropped from it.
+    `entries` is an optional pre-scanned listing of the directory.
+    """
     archives = []
     
-    if not os.path.exists(ARCHIVE_DIR):
-        return archives
+    if entries is None:
+        if not os.path.exists(directory):
+            if cache is not None:
+                cache.clear()
+            return archives
+        entries = iter_files(directory)
     
-    for filename in os.listdir(ARCHIVE_DIR):
-        if filename.endswith('.csv') and not filename.startswith('.'):
-            filepath = os.path.join(ARCHIVE_DIR, filename)
-            
-            # Parse filename: emirate_YYYY-MM-DD.csv
-            parts = filename.replace('.csv', '').split('_')
-            if len(parts) >= 2:
-                emirate = parts[0]
-                date = '_'.join(parts[1:])
-            else:
-                emirate = 'unknown'
-                date = filename.replace('.csv', '')
-            
-            plates = []
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        plates.append({
-                            'plate_number': row.get('plate_number', ''),
-                            'plate_code': row.get('plate_code', ''),
-                            'final_price': int(row.get('final_price', 0) or row.get('current_price', 0) or 0),
-                            'bid_count': int(row.get('bid_count', 0) or 0),
-                        })
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}")
-                continue
-            
-            display_name = EMIRATES_CONFIG.get(emirate, {}).get('display_name', emirate.title())
-            
-            archives.append({
-                'filename': filename,
-                'emirate': display_name,
-                'emirate_key': emirate,
-                'date': date,
-                'plates': sorted(plates, key=lambda x: x['final_price'], reverse=True),
-                'count': len(plates),
-                'total_value': sum(p['final_price'] for p in plates),
-            })
+    # Resolve cache hits first; the rest are parsed below
+    seen = set()
+    slots = []  # [entry, stat, archive or None]
+    for entry in entries:
+        if not matches(entry.name):
+            continue
+        seen.add(entry.name)
+        
+        stat = archive = None
+        if cache is not None:
+            stat = entry.stat()
+            cached = cache.get(entry.name)
+            if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                archive = cached['entry']
+        slots.append([entry, stat, archive])
+    
+    # Files are independent, so parse the misses on a pool to overlap their reads
+    misses = [slot for slot in slots if slot[2] is None]
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(misses))) as executor:
+            for slot, archive in zip(misses, executor.map(parse, [slot[0] for slot in misses])):
+                slot[2] = archive
+                if cache is not None and archive is not None:
+                    stat = slot[1]
+                    cache[slot[0].name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'entry': archive}
+    
+    archives = [archive for _, _, archive in slots if archive is not None]
+    
+    if cache is not None:
+        for filename in cache.keys() - seen:
+            del cache[filename]
     
     # Sort by date descending
-    archives.sort(key=lambda x: x['date'], reverse=True)
+    archives.sort(key=itemgetter('date'), reverse=True)
     return archives
 
 
-def load_archived_buynow() -> list:
-    """Load archived Buy Now CSV files"""
-    archives = []
+def _parse_archive_csv(entry) -> dict:
+    """Parse one archived auction CSV (emirate_YYYY-MM-DD.csv)"""
+    filename = entry.name
+    filepath = entry.path
     
-    if not os.path.exists(BUYNOW_ARCHIVE_DIR):
-        return archives
+    # load_archive_csvs only passes names matching emirate_YYYY-MM-DD.csv
+    match = ARCHIVE_CSV_RE.match(filename)
+    emirate, date = match['emirate'], match['date']
     
-    for filename in os.listdir(BUYNOW_ARCHIVE_DIR):
-        if filename.endswith('.csv'):
-            filepath = os.path.join(BUYNOW_ARCHIVE_DIR, filename)
-            
-            # Parse filename: emirate_buynow_YYYY-MM-DD_HHMMSS.csv
-            parts = filename.replace('.csv', '').split('_')
-            if len(parts) >= 4:
-                emirate = parts[0]
-                date = '_'.join(parts[2:])  # YYYY-MM-DD_HHMMSS
-            else:
-                emirate = 'unknown'
-                date = filename.replace('.csv', '')
-            
-            plates = []
-            total_value = 0
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        price = int(row.get('price', 0) or 0)
-                        plates.append({
-                            'plate_number': row.get('plate_number', ''),
-                            'plate_code': row.get('plate_code', ''),
-                            'price': price,
-                            'status': row.get('status', ''),
-                            'first_seen': row.get('first_seen', ''),
-                            'sold_at': row.get('sold_at', ''),
-                        })
-                        total_value += price
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}")
-                continue
-            
-            display_name = EMIRATES_CONFIG.get(emirate, {}).get('display_name', emirate.title())
-            
-            archives.append({
-                'filename': filename,
-                'emirate': display_name,
-                'emirate_key': emirate,
-                'date': date,
-                'plates': sorted(plates, key=lambda x: x['price'], reverse=True),
-                'count': len(plates),
-                'total_value': total_value,
-                'sold_count': sum(1 for p in plates if p['status'] == 'sold'),
-            })
+    plates = []
+    total_value = 0
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            columns = ('plate_number', 'plate_code', 'final_price', 'current_price', 'bid_count')
+            for plate_number, plate_code, final_price, current_price, bid_count in iter_csv_columns(f, columns):
+                final_price = int(final_price or current_price or 0)
+                plates.append({
+                    'plate_number': plate_number,
+                    'plate_code': plate_code,
+                    'final_price': final_price,
+                    'bid_count': int(bid_count or 0),
+                })
+                total_value += final_price
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return None
     
-    archives.sort(key=lambda x: x['date'], reverse=True)
-    return archives
+    display_name = DISPLAY_NAMES.get(emirate) or emirate.title()
+    
+    return {
+        'filename': filename,
+        'emirate': display_name,
+        'emirate_key': emirate,
+        'date': date,
+        'plates': sorted(plates, key=itemgetter('final_price'), reverse=True),
+        'count': len(plates),
+        'total_value': total_value,
+    }
 
 
-def load_archived_tracking() -> list:
-    """Load archived auction tracking JSONs with full price history"""
-    archives = []
+def load_archive_csvs(cache: dict = None, entries: list = None) -> list:
+    """Load archived auction results (CSV only)"""
+    return _load_archives(
+        ARCHIVE_DIR,
+        lambda name: ARCHIVE_CSV_RE.match(name) is not None,
+        _parse_archive_csv,
+        cache,
+        entries,
+    )
+
+
+def _parse_archived_buynow(entry) -> dict:
+    """Parse one archived Buy Now CSV (emirate_buynow_YYYY-MM-DD_HHMMSS.csv)"""
+    filename = entry.name
+    filepath = entry.path
     
-    if not os.path.exists(ARCHIVE_DIR):
-        return archives
+    # Parse filename: emirate_buynow_YYYY-MM-DD_HHMMSS.csv
+    match = _ARCHIVED_BUYNOW_RE.match(filename)
+    if match:
+        emirate, date = match.groups()  # date is YYYY-MM-DD_HHMMSS
+    else:
+        emirate = 'unknown'
+        date = filename[:-len('.csv')]
     
-    for filename in os.listdir(ARCHIVE_DIR):
-        if filename.startswith('tracking_') and filename.endswith('.json'):
-            filepath = os.path.join(ARCHIVE_DIR, filename)
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    tracking = json.load(f)
-                
-                # Extract emirate from filename: tracking_emirate_YYYY-MM-DD_HHMMSS.json
-                parts = filename.replace('.json', '').split('_')
-                if len(parts) >= 2:
-                    emirate = parts[1]
-                    date = '_'.join(parts[2:]) if len(parts) > 2 else ''
-                else:
-                    emirate = 'unknown'
-                    date = ''
-                
-                plates = []
-                for plate_id, plate_data in tracking.get('plates', {}).items():
-                    final_price = plate_data.get('final_price') or plate_data.get('current_price', 0)
-                    plates.append({
-                        'id': plate_id,
-                        'plate_number': plate_data.get('plate_number', ''),
-                        'plate_code': plate_data.get('plate_code', ''),
-                        'final_price': final_price,
-                        'bid_count': plate_data.get('bid_count', 0),
-                        'status': plate_data.get('status', ''),
-                        'first_seen': plate_data.get('first_seen', ''),
-                        'completed_at': plate_data.get('completed_at', ''),
-                        'price_history': plate_data.get('price_history', []),
-                    })
-                
-                display_name = tracking.get('display_name') or EMIRATES_CONFIG.get(emirate, {}).get('display_name', emirate.title())
-                
-                archives.append({
-                    'filename': filename,
-                    'auction_id': tracking.get('auction_id', ''),
-                    'emirate': display_name,
-                    'emirate_key': emirate,
-                    'date': date,
-                    'start_date': tracking.get('start_date', ''),
-                    'last_updated': tracking.get('last_updated', ''),
-                    'archived_at': tracking.get('archived_at', ''),
-                    'plates': sorted(plates, key=lambda x: x['final_price'], reverse=True),
-                    'count': len(plates),
-                    'total_value': sum(p['final_price'] for p in plates),
+    plates = []
+    total_value = 0
+    sold_count = 0
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            columns = ('plate_number', 'plate_code', 'price', 'status', 'first_seen', 'sold_at')
+            for plate_number, plate_code, price, status, first_seen, sold_at in iter_csv_columns(f, columns):
+                price = int(price or 0)
+                plates.append({
+                    'plate_number': plate_number,
+                    'plate_code': plate_code,
+                    'price': price,
+                    'status': status,
+                    'first_seen': first_seen,
+                    'sold_at': sold_at,
                 })
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}")
-                continue
+                total_value += price
+                sold_count += status == STATUS_SOLD
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return None
     
-    archives.sort(key=lambda x: x['date'], reverse=True)
-    return archives
+    display_name = DISPLAY_NAMES.get(emirate) or emirate.title()
+    
+    return {
+        'filename': filename,
+        'emirate': display_name,
+        'emirate_key': emirate,
+        'date': date,
+        'plates': sorted(plates, key=itemgetter('price'), reverse=True),
+        'count': len(plates),
+        'total_value': total_value,
+        'sold_count': sold_count,
+    }
 
 
-def export_dashboard_data():
-    """Export all data for dashboard consumption"""
+def load_archived_buynow(cache: dict = None, entries: list = None) -> list:
+    """Load archived Buy Now CSV files"""
+    return _load_archives(
+        BUYNOW_ARCHIVE_DIR,
+        lambda name: name.endswith('.csv'),
+        _parse_archived_buynow,
+        cache,
+        entries,
+    )
+
+
+def _price_history_entries(history: list) -> list:
+    """Expand [price, timestamp] pairs from the tracker into the dashboard's {price, timestamp} objects"""
+    return [
+        {'price': h[0], 'timestamp': h[1]} if isinstance(h, list) else h
+        for h in history
+    ]
+
+
+def _parse_archived_tracking(entry) -> dict:
+    """Parse one archived tracking JSON (tracking_emirate_YYYY-MM-DD_HHMMSS.json, optionally gzipped)"""
+    filename = entry.name
+    filepath = entry.path
+    
+    try:
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filepath, 'rb') as f:
+            tracking = json.loads(f.read())
+        
+        # Extract emirate from filename: tracking_emirate_YYYY-MM-DD_HHMMSS.json
+        match = _ARCHIVED_TRACKING_RE.match(filename)
+        if match:
+            emirate, date = match.group(1), match.group(2) or ''
+        else:
+            emirate = 'unknown'
+            date = ''
+        
+        plates = []
+        total_value = 0
+        for plate_id, plate_data in tracking.get('plates', {}).items():
+            final_price = plate_data.get('final_price') or plate_data.get('current_price', 0)
+            total_value += final_price
+            plates.append({
+                'id': plate_id,
+                'plate_number': plate_data.get('plate_number', ''),
+                'plate_code': plate_data.get('plate_code', ''),
+                'final_price': final_price,
+                'bid_count': plate_data.get('bid_count', 0),
+                'status': plate_data.get('status', ''),
+                'first_seen': plate_data.get('first_seen', ''),
+                'completed_at': plate_data.get('completed_at', ''),
+                'price_history': _price_history_entries(plate_data.get('price_history', [])),
+            })
+        
+        display_name = tracking.get('display_name') or DISPLAY_NAMES.get(emirate) or emirate.title()
+        
+        return {
+            'filename': filename,
+            'auction_id': tracking.get('auction_id', ''),
+            'emirate': display_name,
+            'emirate_key': emirate,
+            'date': date,
+            'start_date': tracking.get('start_date', ''),
+            'last_updated': tracking.get('last_updated', ''),
+            'archived_at': tracking.get('archived_at', ''),
+            'plates': sorted(plates, key=itemgetter('final_price'), reverse=True),
+            'count': len(plates),
+            'total_value': total_value,
+        }
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return None
+
+
+def load_archived_tracking(cache: dict = None, entries: list = None) -> list:
+    """Load archived auction tracking JSONs with full price history"""
+    return _load_archives(
+        ARCHIVE_DIR,
+        lambda name: name.startswith('tracking_') and name.endswith(('.json', '.json.gz')),
+        _parse_archived_tracking,
+        cache,
+        entries,
+    )
+
+
+def export_dashboard_data(force: bool = False):
+    """
+    Export all data for dashboard consumption.
+    
+    Skipped when no input file (nor data.json itself) changed since the
+    last export, unless `force` is set (--force on the command line).
+    """
     print("Exporting dashboard data...")
     
-    buynow = load_buynow_csvs()
-    auctions = load_tracking_files()
-    archives = load_archive_csvs()
-    archived_buynow = load_archived_buynow()
-    archived_tracking = load_archived_tracking()
+    # One timestamp for the whole export, shared by generated_at and loader fallbacks
+    now_iso = utc_timestamp()
+    
+    output_path = os.path.join('dashboard', 'public', 'data.json')
+    # Kept under data/ so it never ships with the dashboard's static files
+    stamp_path = EXPORT_STAMP_FILE
+    
+    # Compact output unless PRETTY_JSON is set (e.g. for inspecting the file by hand)
+    pretty = bool(os.environ.get('PRETTY_JSON'))
+    
+    # Each directory is listed once; the archive CSV and tracking loaders share ARCHIVE_DIR's listing
+    listings = _scan_directories(DATA_DIR, BUYNOW_DIR, ARCHIVE_DIR, BUYNOW_ARCHIVE_DIR)
+    
+    fingerprint = _fingerprint(listings, output_path, pretty)
+    if not force and os.path.exists(stamp_path):
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            if f.read().strip() == fingerprint:
+                print(f"No changes since last export, keeping: {output_path}")
+                return output_path
+    
+    # Archive loaders reuse parsed entries for files unchanged since the last export
+    index = _load_archive_index()
+    archive_caches = {name: index.setdefault(name, {}) for name in ('archives', 'archived_buynow', 'archived_tracking')}
+    
+    # The loaders only read the shared listings and each gets its own cache
+    # section, so they share no mutable state and can run side by side
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(load_buynow_csvs, listings.get(BUYNOW_DIR), now_iso),
+            executor.submit(load_tracking_files, listings.get(DATA_DIR)),
+            executor.submit(load_archive_csvs, archive_caches['archives'], listings.get(ARCHIVE_DIR)),
+            executor.submit(load_archived_buynow, archive_caches['archived_buynow'], listings.get(BUYNOW_ARCHIVE_DIR)),
+            executor.submit(load_archived_tracking, archive_caches['archived_tracking'], listings.get(ARCHIVE_DIR)),
+        ]
+        buynow, auctions, archives, archived_buynow, archived_tracking = [future.result() for future in futures]
+    
+    _save_archive_index(index)
     
     # Calculate totals
     buynow_available = sum(d['available_count'] for d in buynow.values())
     buynow_sold = sum(d['sold_count'] for d in buynow.values())
     
     dashboard_data = {
-        'generated_at': datetime.utcnow().isoformat() + 'Z',
+        'generated_at': now_iso,
         'buynow': buynow,
         'auctions': auctions,
         'archives': archives,
@@ -311,11 +499,26 @@ def export_dashboard_data():
     }
     
     # Save to dashboard public folder
-    output_path = os.path.join('dashboard', 'public', 'data.json')
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(dashboard_data, f, indent=2, ensure_ascii=False)
+    # The default compact dump runs on the C encoder. PRETTY_JSON's indent=2
+    # falls back to the pure-Python encoder (~5x slower, ~2x larger output),
+    # which is fine for a file meant for reading by hand. Either way the
+    # encoded bytes go to the binary file in a single write
+    if pretty:
+        payload = json.dumps(dashboard_data, ensure_ascii=False, indent=2).encode('utf-8')
+    else:
+        payload = json.dumps(dashboard_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # Written beside the target and renamed over it, so readers never see a partial file
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, output_path)
+    
+    # Stamp the inputs this export was built from (including the new data.json)
+    os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        f.write(_fingerprint(listings, output_path, pretty))
     
     print(f"Exported to: {output_path}")
     print(f"  Buy Now: {buynow_available} available, {buynow_sold} sold")
@@ -328,4 +531,6 @@ def export_dashboard_data():
 
 
 if __name__ == '__main__':
-    export_dashboard_data()
+    parser = argparse.ArgumentParser(description='Export auction data to JSON for the dashboard')
+    parser.add_argument('--force', action='store_true', help='export even if no input changed since the last run')
+    export_dashboard_data(force=parser.parse_args().force)
@@ -0,0 +1,79 @@
+"""
+File listing and CSV column reading shared by the loaders
+"""
+
+import csv
+import os
+import re
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+# Completed auction CSVs in ARCHIVE_DIR, e.g. sharjah_2024-12-24.csv; other names are not auctions
+ARCHIVE_CSV_RE = re.compile(r'^(?P<emirate>[a-z_]+?)_(?P<date>\d{4}-\d{2}-\d{2})\.csv$')
+
+
+def iter_files(directory: str) -> Iterator[os.DirEntry]:
+    """Yield DirEntry objects for the regular files in a directory"""
+    # scandir returns the full path and cached file type with each entry
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                yield entry
+
+
+def row_projector(header: List[str], columns: Iterable[str], defaults: Optional[dict] = None) -> Callable[[list], tuple]:
+    """
+    Build a function mapping a raw csv.reader row to a tuple of the named columns.
+    
+    Uses one itemgetter over the header positions instead of a dict per
+    row. Columns missing from the header read as their value in
+    `defaults` (or ''), short rows are padded with '' and extra cells
+    are ignored. A repeated header name reads its last column, as with
+    csv.DictReader.
+    """
+    width = len(header)
+    # Built in header order, so a later duplicate overwrites an earlier one
+    index = {name: i for i, name in enumerate(header)}
+    # Missing columns point past the header, at values appended to each row
+    fill = []
+    positions = []
+    for name in columns:
+        i = index.get(name)
+        if i is None:
+            i = width + len(fill)
+            fill.append((defaults or {}).get(name, ''))
+        positions.append(i)
+    
+    if len(positions) == 1:
+        # itemgetter with one index returns the bare value, so build the 1-tuple here
+        position = positions[0]
+        
+        def getter(row: list) -> tuple:
+            return (row[position],)
+    else:
+        getter = itemgetter(*positions)
+    
+    def project(row: list) -> tuple:
+        if len(row) != width:
+            row = row[:width] + [''] * (width - len(row))
+        return getter(row + fill) if fill else getter(row)
+    return project
+
+
+def iter_csv_columns(f, columns: Iterable[str], defaults: Optional[dict] = None) -> Iterator[tuple]:
+    """
+    Yield a tuple of the named columns for each row of an open CSV file.
+    
+    See row_projector for missing columns and short rows; blank lines
+    are skipped, matching csv.DictReader.
+    """
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if not header:
+        return
+    
+    project = row_projector(header, columns, defaults)
+    for row in reader:
+        if row:
+            yield project(row)
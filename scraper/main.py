@@ -3,30 +3,39 @@ Main entry point for Emirates Auction Scraper
 """
 
 import os
-import sys
 import json
+import argparse
 from datetime import datetime
 
 from .api import fetch_current_plates, check_active_auctions
 from .tracker import AuctionTracker
 from .buynow import scrape_all_buynow, scrape_buynow_emirate
-from .config import ALL_EMIRATES, EMIRATES_CONFIG, BUYNOW_EMIRATES
+from .config import ALL_EMIRATES, EMIRATES_CONFIG, BUYNOW_EMIRATES, DISPLAY_NAMES
 
 
-def scrape_emirate(emirate: str) -> dict:
-    """Scrape a single emirate auction and return results"""
-    display_name = EMIRATES_CONFIG.get(emirate, {}).get("display_name", emirate)
+def scrape_emirate(emirate: str, reset: bool = False) -> dict:
+    """Scrape a single emirate auction and return results (reset restarts a completed one)"""
+    display_name = DISPLAY_NAMES.get(emirate, emirate)
     
     print(f"\n{'='*50}")
     print(f"Auction: {display_name}")
     print(f"{'='*50}")
     
     tracker = AuctionTracker(emirate)
+    try:
+        return _scrape_tracked(tracker, emirate, display_name, reset)
+    finally:
+        # Write anything save_state's debounce held back, even if the scrape failed
+        tracker.flush()
+
+
+def _scrape_tracked(tracker: AuctionTracker, emirate: str, display_name: str, reset: bool) -> dict:
+    """Run one scrape against a loaded tracker (scrape_emirate flushes it afterwards)"""
     print(f"Loaded tracking state: {tracker.state.get('auction_id', 'new')}")
     
     if tracker.state.get("status") == "completed":
         print(f"Auction already completed for {display_name}.")
-        if "--reset" in sys.argv:
+        if reset:
             print("Resetting...")
             tracker.reset_for_new_auction()
         else:
@@ -84,33 +93,46 @@ def scrape_emirate(emirate: str) -> dict:
     }
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command line once; unrecognised arguments are ignored"""
+    parser = argparse.ArgumentParser(description="Emirates Auction Scraper")
+    parser.add_argument("--buynow", action="store_true", help="scrape Buy Now sections")
+    parser.add_argument("--discover", action="store_true", help="check which emirates have an active auction")
+    parser.add_argument("--reset", action="store_true", help="restart tracking for completed auctions")
+    # const="" marks a bare --emirate so it can be reported instead of exiting
+    parser.add_argument("--emirate", nargs="?", const="", help="only scrape this emirate")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def main(args: argparse.Namespace = None):
     """Main scraping function"""
+    if args is None:
+        args = parse_args()
+    
     print(f"{'='*60}")
     print(f"Emirates Auction Scraper")
     print(f"Run time: {datetime.utcnow().isoformat()}Z")
     print(f"{'='*60}")
     
     # Buy Now mode - scrape Buy Now sections
-    if "--buynow" in sys.argv:
+    if args.buynow:
         print("\n🛒 BUY NOW MODE")
         
-        if "--emirate" in sys.argv:
-            idx = sys.argv.index("--emirate")
-            if idx + 1 < len(sys.argv):
-                emirate = sys.argv[idx + 1]
-                if emirate in BUYNOW_EMIRATES:
-                    result = scrape_buynow_emirate(emirate)
-                    return {"mode": "buynow", "results": {emirate: result}}
-                else:
-                    print(f"No Buy Now section for {emirate}")
-                    return {"mode": "buynow", "status": "no_section"}
+        emirate = args.emirate
+        if emirate:
+            if emirate in BUYNOW_EMIRATES:
+                result = scrape_buynow_emirate(emirate)
+                return {"mode": "buynow", "results": {emirate: result}}
+            else:
+                print(f"No Buy Now section for {emirate}")
+                return {"mode": "buynow", "status": "no_section"}
         
         result = scrape_all_buynow()
         return {"mode": "buynow", **result}
     
     # Discovery mode
-    if "--discover" in sys.argv:
+    if args.discover:
         print("\n🔍 DISCOVERY MODE: Checking all emirates...")
         active_auctions = check_active_auctions()
         
@@ -126,10 +148,9 @@ def main():
         return {"mode": "discover", "active_emirates": active_list, "details": active_auctions}
     
     # Single emirate mode
-    if "--emirate" in sys.argv:
-        idx = sys.argv.index("--emirate")
-        if idx + 1 < len(sys.argv):
-            emirates_to_scrape = [sys.argv[idx + 1]]
+    if args.emirate is not None:
+        if args.emirate:
+            emirates_to_scrape = [args.emirate]
         else:
             print("Error: --emirate requires emirate name")
             return {"status": "error"}
@@ -145,7 +166,7 @@ def main():
             print(f"Unknown emirate: {emirate}")
             continue
         
-        result = scrape_emirate(emirate)
+        result = scrape_emirate(emirate, reset=args.reset)
         results[emirate] = result
         
         if result.get("rapid_mode", False):
@@ -156,7 +177,7 @@ def main():
     print(f"\n{'='*60}")
     print("SUMMARY")
     for emirate, result in results.items():
-        display_name = EMIRATES_CONFIG.get(emirate, {}).get("display_name", emirate)
+        display_name = DISPLAY_NAMES.get(emirate, emirate)
         print(f"  {display_name}: {result.get('status')} ({result.get('total_plates', 0)} plates)")
     
     set_github_output("any_rapid_mode", str(any_rapid_mode).lower())
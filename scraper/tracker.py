@@ -4,15 +4,21 @@ State management and tracking logic for auction data
 
 import json
 import csv
+import gzip
 import os
-from datetime import datetime
+import shutil
+import time
+from operator import itemgetter
 from typing import Optional
 from .config import (
     DATA_DIR,
     ARCHIVE_DIR,
     FINAL_HOURS_THRESHOLD_MINUTES,
-    EMIRATES_CONFIG,
+    STATE_SAVE_INTERVAL_SECONDS,
+    WRITE_BUFFER_SIZE,
+    DISPLAY_NAMES,
     get_tracking_file,
+    utc_timestamp,
 )
 
 
@@ -22,23 +28,41 @@ class AuctionTracker:
     def __init__(self, emirate: str):
         self.emirate = emirate
         self.tracking_file = get_tracking_file(emirate)
-        self.display_name = EMIRATES_CONFIG.get(emirate, {}).get("display_name", emirate)
-        self.state = self._load_state()
+        self.display_name = DISPLAY_NAMES.get(emirate, emirate)
+        self._set_state(self._load_state())
+        
+        # Save bookkeeping: _dirty marks changes not yet written, set only by real
+        # mutations; the owner calls flush() once done with the tracker
+        self._dirty = False
+        self._last_save = None
+        self._tracking_dir_ready = False
 
     def _load_state(self) -> dict:
         """Load existing state from tracking file or create new"""
         if os.path.exists(self.tracking_file):
             try:
-                with open(self.tracking_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
+                # One read, decoded by the C scanner straight from UTF-8 bytes
+                with open(self.tracking_file, "rb") as f:
+                    state = json.loads(f.read())
+                self._migrate_price_history(state)
+                return state
+            except (ValueError, OSError) as e:
                 print(f"Error loading state for {self.emirate}: {e}")
         return self._create_new_state()
 
+    @staticmethod
+    def _migrate_price_history(state: dict):
+        """Convert old {"price", "timestamp"} price_history entries to [price, timestamp] pairs"""
+        for plate in state.get("plates", {}).values():
+            history = plate.get("price_history")
+            if history and isinstance(history[0], dict):
+                plate["price_history"] = [[h.get("price"), h.get("timestamp")] for h in history]
+
     def _create_new_state(self) -> dict:
         """Create a fresh tracking state"""
-        now = datetime.utcnow().isoformat() + "Z"
-        month_str = datetime.utcnow().strftime("%Y-%m")
+        now_ts = time.time()
+        now = utc_timestamp(now_ts)
+        month_str = time.strftime("%Y-%m", time.gmtime(now_ts))
         
         return {
             "auction_id": f"{self.emirate}_{month_str}",
@@ -51,27 +75,82 @@ class AuctionTracker:
             "stats": {"total_plates_seen": 0, "completed_plates": 0, "active_plates": 0}
         }
 
-    def save_state(self):
-        """Save current state to tracking file"""
-        os.makedirs(os.path.dirname(self.tracking_file), exist_ok=True)
-        self.state["last_updated"] = datetime.utcnow().isoformat() + "Z"
-        with open(self.tracking_file, "w", encoding="utf-8") as f:
-            json.dump(self.state, f, indent=2, ensure_ascii=False)
+    def _set_state(self, state: dict):
+        """
+        Install a tracking state and rebuild the lookups derived from it.
+        
+        Keeps the set of active lot ids, and recounts state["stats"] if the
+        loaded counters don't match the plates (some archived files store
+        totals that add up but split active/completed wrongly).
+        """
+        self.state = state
+        self._dirty = True
+        plates = state.setdefault("plates", {})
+        self._active_lot_ids = {lot_id for lot_id, p in plates.items() if p["status"] == "active"}
+        
+        total = len(plates)
+        active = len(self._active_lot_ids)
+        # Plates are either active or completed, so the set gives both counters
+        expected = {"total_plates_seen": total, "completed_plates": total - active, "active_plates": active}
+        stats = state.get("stats") or {}
+        if any(stats.get(key) != value for key, value in expected.items()):
+            state["stats"] = expected
+
+    def save_state(self, force: bool = False):
+        """
+        Save current state to tracking file.
+        
+        Unless `force` is set, a save with no changes since the last write is
+        skipped, and one within STATE_SAVE_INTERVAL_SECONDS of it is held
+        back until a later save or flush().
+        """
+        if not force:
+            if not self._dirty:
+                return
+            if self._last_save is not None and time.monotonic() - self._last_save < STATE_SAVE_INTERVAL_SECONDS:
+                return
+        
+        if not self._tracking_dir_ready:
+            os.makedirs(os.path.dirname(self.tracking_file), exist_ok=True)
+            self._tracking_dir_ready = True
+        self.state["last_updated"] = utc_timestamp()
+        # Encoded in one go and written with a single call rather than json.dump's many small writes
+        data = json.dumps(self.state, indent=2, ensure_ascii=False).encode("utf-8")
+        # Written beside the file and renamed over it, so a crash never leaves a truncated state
+        tmp_path = f"{self.tracking_file}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.tracking_file)
+        
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def flush(self):
+        """Write any changes held back by save_state's debounce (call when done with the tracker)"""
+        if self._dirty:
+            self.save_state(force=True)
 
     def update_from_api(self, api_data: dict) -> dict:
         """Update tracking state with fresh API data."""
-        now = datetime.utcnow().isoformat() + "Z"
+        now = utc_timestamp()
         api_plates = api_data.get("plates", [])
         api_lot_ids = {p["lot_id"] for p in api_plates}
         
         new_plates = updated_plates = completed_plates = 0
         min_time_remaining = float("inf")
+        # Counters are kept in step with each status change instead of recounted
+        stats = self.state["stats"]
+        # Bound once; the loop below touches these for every plate
+        plates = self.state["plates"]
+        active_lot_ids = self._active_lot_ids
         
         for plate in api_plates:
             lot_id = plate["lot_id"]
+            # One hash lookup decides new vs existing and fetches the record
+            existing = plates.get(lot_id)
             
-            if lot_id not in self.state["plates"]:
-                self.state["plates"][lot_id] = {
+            if existing is None:
+                plates[lot_id] = {
                     "plate_number": plate["plate_number"],
                     "plate_code": plate["plate_code"],
                     "current_price": plate["current_price"],
@@ -81,40 +160,44 @@ class AuctionTracker:
                     "status": "active",
                     "final_price": None,
                     "completed_at": None,
-                    "price_history": [{"price": plate["current_price"], "timestamp": now}],
+                    # [price, timestamp] pairs; far fewer objects and bytes than a dict per tick
+                    "price_history": [[plate["current_price"], now]],
                 }
                 new_plates += 1
+                stats["active_plates"] += 1
+                active_lot_ids.add(lot_id)
             else:
-                existing = self.state["plates"][lot_id]
                 if existing["status"] == "completed":
                     continue
                 
                 if existing["current_price"] != plate["current_price"]:
-                    existing["price_history"].append({"price": plate["current_price"], "timestamp": now})
+                    existing["price_history"].append([plate["current_price"], now])
                     updated_plates += 1
                 
                 existing["current_price"] = plate["current_price"]
                 existing["bid_count"] = plate["bid_count"]
                 existing["last_seen"] = now
             
-            if plate.get("time_remaining_seconds") is not None:
-                min_time_remaining = min(min_time_remaining, plate["time_remaining_seconds"])
-        
-        for lot_id, plate_data in self.state["plates"].items():
-            if plate_data["status"] == "active" and lot_id not in api_lot_ids:
-                plate_data["status"] = "completed"
-                plate_data["final_price"] = plate_data["current_price"]
-                plate_data["completed_at"] = now
-                completed_plates += 1
-        
-        active_count = sum(1 for p in self.state["plates"].values() if p["status"] == "active")
-        completed_count = sum(1 for p in self.state["plates"].values() if p["status"] == "completed")
-        
-        self.state["stats"] = {
-            "total_plates_seen": len(self.state["plates"]),
-            "completed_plates": completed_count,
-            "active_plates": active_count,
-        }
+            # Inline compare instead of a min() call per plate
+            time_remaining = plate.get("time_remaining_seconds")
+            if time_remaining is not None and time_remaining < min_time_remaining:
+                min_time_remaining = time_remaining
+        
+        # Only still-active lots can complete, so diff those against the API instead of scanning every plate
+        newly_completed = active_lot_ids - api_lot_ids
+        active_lot_ids -= newly_completed
+        for lot_id in newly_completed:
+            plate_data = plates[lot_id]
+            plate_data["status"] = "completed"
+            plate_data["final_price"] = plate_data["current_price"]
+            plate_data["completed_at"] = now
+            completed_plates += 1
+            stats["active_plates"] -= 1
+            stats["completed_plates"] += 1
+        
+        stats["total_plates_seen"] = len(plates)
+        self._dirty = True
+        active_count = stats["active_plates"]
         
         is_final_hours = min_time_remaining < (FINAL_HOURS_THRESHOLD_MINUTES * 60)
         
@@ -125,47 +208,51 @@ class AuctionTracker:
             "is_final_hours": is_final_hours,
             "min_time_remaining_seconds": min_time_remaining if min_time_remaining != float("inf") else None,
             "active_count": active_count,
-            "total_count": len(self.state["plates"]),
+            "total_count": len(plates),
         }
 
     def is_auction_complete(self) -> bool:
         """Check if all tracked plates have completed"""
-        if not self.state["plates"]:
-            return False
-        return all(p["status"] == "completed" for p in self.state["plates"].values())
+        # Plates are either active or completed, so no active lot ids means all are done
+        return bool(self.state["plates"]) and not self._active_lot_ids
 
-    def generate_final_csv(self) -> str:
-        """Generate final CSV with all auction results."""
+    def generate_final_csv(self, now_ts: Optional[float] = None) -> str:
+        """Generate final CSV with all auction results (dated now_ts, default now)."""
         os.makedirs(ARCHIVE_DIR, exist_ok=True)
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        date_str = time.strftime("%Y-%m-%d", time.gmtime(now_ts))
         csv_path = os.path.join(ARCHIVE_DIR, f"{self.emirate}_{date_str}.csv")
         
-        sorted_plates = sorted(
-            self.state["plates"].values(),
-            key=lambda x: x.get("final_price") or x.get("current_price") or 0,
-            reverse=True
-        )
+        # Final price worked out once per plate, then shared by the sort and the row
+        priced_plates = [
+            (plate.get("final_price") or plate.get("current_price") or 0, plate)
+            for plate in self.state["plates"].values()
+        ]
+        priced_plates.sort(key=itemgetter(0), reverse=True)
         
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        # Large buffer so rows reach the disk in a few big writes, not one per row
+        with open(csv_path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(["emirate", "plate_number", "plate_code", "final_price", "bid_count", "first_seen", "completed_at", "price_changes"])
             
-            for plate in sorted_plates:
-                final_price = plate.get("final_price") or plate.get("current_price", 0)
-                price_changes = len(plate.get("price_history", [])) - 1
-                writer.writerow([
-                    self.display_name,
+            display_name = self.display_name
+            # One writerows call over a generator; the row loop stays in C
+            writer.writerows(
+                (
+                    display_name,
                     plate["plate_number"],
                     plate["plate_code"],
                     final_price,
                     plate["bid_count"],
                     plate["first_seen"],
                     plate.get("completed_at", ""),
-                    max(0, price_changes),
-                ])
+                    max(0, len(plate.get("price_history", [])) - 1),
+                )
+                for final_price, plate in priced_plates
+            )
         
         self.state["status"] = "completed"
         self.state["csv_generated"] = csv_path
+        self._dirty = True
         return csv_path
 
     def archive_completed_auction(self) -> dict:
@@ -175,34 +262,43 @@ class AuctionTracker:
         
         Returns dict with archive paths for CSV and JSON.
         """
-        os.makedirs(ARCHIVE_DIR, exist_ok=True)
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
-        timestamp_str = datetime.utcnow().strftime("%Y-%m-%d_%H%M%S")
+        # One clock read names both archive files and stamps archived_at
+        now_ts = time.time()
+        timestamp_str = time.strftime("%Y-%m-%d_%H%M%S", time.gmtime(now_ts))
+        archived_at = utc_timestamp(now_ts)
         
-        # Generate final CSV
-        csv_path = self.generate_final_csv()
+        # Generate final CSV (this also creates ARCHIVE_DIR)
+        csv_path = self.generate_final_csv(now_ts)
         
-        # Archive the tracking JSON
-        json_archive_path = os.path.join(ARCHIVE_DIR, f"tracking_{self.emirate}_{timestamp_str}.json")
+        # Archive the tracking JSON, gzipped: archives are kept forever and compress ~10x
+        json_archive_path = os.path.join(ARCHIVE_DIR, f"tracking_{self.emirate}_{timestamp_str}.json.gz")
         if os.path.exists(self.tracking_file):
             # Save final state before archiving
             self.state["status"] = "archived"
-            self.state["archived_at"] = datetime.utcnow().isoformat() + "Z"
-            self.save_state()
+            self.state["archived_at"] = archived_at
+            self.save_state(force=True)
             
-            os.rename(self.tracking_file, json_archive_path)
+            # Level 1 compresses faster than the disk write it saves
+            tmp_path = f"{json_archive_path}.tmp"
+            # Named after the final .gz (not the .tmp) so the gzip header records the real name
+            with open(self.tracking_file, "rb") as src, open(tmp_path, "wb") as raw, gzip.GzipFile(
+                filename=os.path.basename(json_archive_path), mode="wb", fileobj=raw, compresslevel=1
+            ) as dst:
+                shutil.copyfileobj(src, dst, WRITE_BUFFER_SIZE)
+            os.replace(tmp_path, json_archive_path)
+            os.remove(self.tracking_file)
         
         # Create fresh state for next auction
-        self.state = self._create_new_state()
-        self.save_state()
+        self._set_state(self._create_new_state())
+        self.save_state(force=True)
         
         return {
             "csv_path": csv_path,
             "json_path": json_archive_path,
-            "archived_at": datetime.utcnow().isoformat() + "Z"
+            "archived_at": archived_at
         }
 
     def reset_for_new_auction(self):
         """Reset tracking for new auction (use archive_completed_auction if auction completed)"""
-        self.state = self._create_new_state()
-        self.save_state()
+        self._set_state(self._create_new_state())
+        self.save_state(force=True)